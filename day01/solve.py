@@ -2,6 +2,8 @@ from dotenv import load_dotenv
 import sys
 from collections import Counter
 from pathlib import Path
+from typing import Optional
+import numpy as np
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -47,6 +49,98 @@ def solve_part2(input_data: str) -> int:
 
     return similarity_score
 
+# Rows handled per block by parse_fixed_width; small enough for a block's
+# column passes to stay in cache
+PARSE_BLOCK_ROWS = 1 << 15
+
+def parse_fixed_width(data: bytes) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """
+    Parse input whose rows all share the first row's layout (a run of digits,
+    spaces, a run of digits), as puzzle inputs do. The input is viewed as a
+    2-D byte array and each number is built up one digit column at a time.
+    Returns None if the input doesn't have that layout.
+    """
+    width = data.find(b'\n')
+    stride = width + 1
+    if width <= 0 or len(data) % stride not in (0, width):
+        return None
+    if len(data) % stride:
+        data += b'\n'
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+
+    first = rows[0]
+    is_digit = (first >= ord('0')) & (first <= ord('9'))
+    edges = np.flatnonzero(np.diff(is_digit[:width].astype(np.int8)))
+    if len(edges) != 2 or not is_digit[0] or (first[edges[0] + 1:edges[1] + 1] != ord(' ')).any():
+        return None
+    spans = ((0, edges[0] + 1), (edges[1] + 1, width))
+    dtype = np.int32 if max(hi - lo for lo, hi in spans) <= 9 else np.int64
+
+    # Expected bytes for a whole block, checked as flat arrays: digit cells
+    # must be digits and every other cell must match the first row
+    block_digits = np.tile(is_digit, PARSE_BLOCK_ROWS)
+    block_other = np.tile(np.where(is_digit, 0, first), PARSE_BLOCK_ROWS)
+    block_keep = np.tile((~is_digit).astype(np.uint8), PARSE_BLOCK_ROWS)
+
+    columns = [np.empty(len(rows), dtype=dtype) for _ in spans]
+    for start in range(0, len(rows), PARSE_BLOCK_ROWS):
+        block = rows[start:start + PARSE_BLOCK_ROWS]
+        digits = block - np.uint8(ord('0'))
+        size = block.size
+        if ((digits.reshape(-1) < 10) != block_digits[:size]).any():
+            return None
+        if (block.reshape(-1) * block_keep[:size] != block_other[:size]).any():
+            return None
+        for column, (lo, hi) in zip(columns, spans):
+            value = digits[:, lo].astype(dtype)
+            for col in range(lo + 1, hi):
+                value *= 10
+                value += digits[:, col]
+            column[start:start + PARSE_BLOCK_ROWS] = value
+    return columns[0], columns[1]
+
+def parse_arrays(input_data: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse input into left and right integer arrays. Fixed-width input takes the
+    parse_fixed_width fast path; anything else is parsed in a single bulk pass.
+    """
+    columns = parse_fixed_width(input_data.encode())
+    if columns is not None:
+        return columns
+    # With a separator, fromstring treats any run of whitespace (including newlines) as one
+    values = np.fromstring(input_data, dtype=np.int64, sep=' ')
+    if values.size % 2:
+        raise ValueError("Input must contain pairs of numbers")
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+def total_distance(left: np.ndarray, right: np.ndarray) -> int:
+    """Part 1 on already sorted arrays."""
+    return int(np.abs(left - right).sum())
+
+def run_lengths(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """The distinct values of a sorted array and how many times each occurs."""
+    if not len(values):
+        return values, values
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(values)) + 1))
+    return values[starts], np.diff(np.append(starts, len(values)))
+
+def similarity_score(left: np.ndarray, right: np.ndarray) -> int:
+    """Part 2 on already sorted arrays."""
+    # Each distinct left value's count, times its count in the right list
+    # found by binary searching its span
+    values, left_counts = run_lengths(left)
+    right_counts = np.searchsorted(right, values, side='right') - np.searchsorted(right, values, side='left')
+    return int((values.astype(np.int64) * left_counts * right_counts).sum())
+
+def solve_part1_numpy(input_data: str) -> int:
+    left, right = parse_arrays(input_data)
+    return total_distance(np.sort(left), np.sort(right))
+
+def solve_part2_numpy(input_data: str) -> int:
+    left, right = parse_arrays(input_data)
+    return similarity_score(np.sort(left), np.sort(right))
+
 def main():
     # Test examples
     example_input = """3 4
@@ -57,18 +151,23 @@ def main():
 3 3"""
     assert solve_part1(example_input) == 11, "Part 1 example failed!"
     assert solve_part2(example_input) == 31, "Part 2 example failed!"
+    assert solve_part1_numpy(example_input) == 11, "Part 1 numpy example failed!"
+    assert solve_part2_numpy(example_input) == 31, "Part 2 numpy example failed!"
 
     # Solve actual puzzle
     load_dotenv()
     client = AocClient()
     input_data = client.get_input(1)
 
+    # Parse and sort once for both parts
+    left, right = (np.sort(column) for column in parse_arrays(input_data))
+
     # Part 1
-    answer1 = solve_part1(input_data)
+    answer1 = total_distance(left, right)
     print(f"Part 1: {answer1}")
 
     # Part 2
-    answer2 = solve_part2(input_data)
+    answer2 = similarity_score(left, right)
     print(f"Part 2: {answer2}")
 
     # Submit part 2
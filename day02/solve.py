@@ -1,6 +1,8 @@
 from dotenv import load_dotenv
 import sys
+from collections import defaultdict
 from pathlib import Path
+import numpy as np
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -30,6 +32,85 @@ def is_safe_report(levels: list[int]) -> bool:
 
     return True
 
+def find_violation(levels: list[int], direction: int, skip: int = -1) -> tuple[int, int] | None:
+    """
+    Scan levels (ignoring index skip) for the first step that doesn't move 1-3 in direction.
+    Returns the indices of the two levels forming that step, or None if every step is safe.
+    """
+    prev = -1
+    for i, level in enumerate(levels):
+        if i == skip:
+            continue
+        if prev != -1:
+            step = (level - levels[prev]) * direction
+            if step < 1 or step > 3:
+                return prev, i
+        prev = i
+    return None
+
+def is_safe_with_dampener(levels: list[int]) -> bool:
+    """Check if the report is safe after removing at most one level, in O(n)."""
+    for direction in (1, -1):
+        violation = find_violation(levels, direction)
+        if violation is None:
+            return True
+        # Any removal other than one of the two offending levels leaves that bad
+        # step in place, so those are the only candidates worth trying
+        if any(find_violation(levels, direction, skip) is None for skip in violation):
+            return True
+    return False
+
+def parse_reports(input_data: str) -> list[list[int]]:
+    return [[int(x) for x in line.split()] for line in input_data.strip().split('\n')]
+
+def batched_safety(reports: np.ndarray, dampener: bool = False) -> np.ndarray:
+    """
+    Evaluate a 2D array of equal-length reports at once.
+    Returns a boolean array marking which reports are safe.
+    """
+    count, length = reports.shape
+    if length < 2 or (dampener and length < 3):
+        return np.ones(count, dtype=bool)
+
+    diffs = np.diff(reports, axis=1)
+    # Differences between levels two apart, for steps that bridge a removed level
+    skip_diffs = reports[:, 2:] - reports[:, :-2]
+
+    safe = np.zeros(count, dtype=bool)
+    for direction in (1, -1):
+        steps = diffs * direction
+        ok = (steps >= 1) & (steps <= 3)
+        if not dampener:
+            safe |= ok.all(axis=1)
+            continue
+
+        # prefix[:, k] is True if steps 0..k-1 are all ok; suffix[:, k] if steps k.. are
+        ones = np.ones((count, 1), dtype=bool)
+        prefix = np.hstack([ones, np.logical_and.accumulate(ok, axis=1)])
+        suffix = np.hstack([np.logical_and.accumulate(ok[:, ::-1], axis=1)[:, ::-1], ones])
+
+        skip_steps = skip_diffs * direction
+        bridge_ok = (skip_steps >= 1) & (skip_steps <= 3)
+
+        # Removing level k keeps steps 0..k-2 and k+1.., plus the bridge k-1 -> k+1
+        safe |= suffix[:, 1]                       # remove the first level
+        safe |= prefix[:, length - 2]              # remove the last level
+        safe |= (prefix[:, :length - 2] & bridge_ok & suffix[:, 2:]).any(axis=1)
+    return safe
+
+def solve_batched(input_data: str) -> tuple[int, int]:
+    """Solve both parts by grouping reports by length and checking each group at once."""
+    groups = defaultdict(list)
+    for levels in parse_reports(input_data):
+        groups[len(levels)].append(levels)
+
+    part1 = part2 = 0
+    for reports in groups.values():
+        array = np.array(reports, dtype=np.int64)
+        part1 += int(batched_safety(array).sum())
+        part2 += int(batched_safety(array, dampener=True).sum())
+    return part1, part2
+
 def solve_part1(input_data: str) -> int:
     # Parse input
     reports = []
@@ -41,7 +122,10 @@ def solve_part1(input_data: str) -> int:
     return sum(1 for report in reports if is_safe_report(report))
 
 def solve_part2(input_data: str) -> int:
-    return 0  # Placeholder for part 2
+    reports = parse_reports(input_data)
+
+    # Count reports that are safe with at most one level removed
+    return sum(1 for report in reports if is_safe_with_dampener(report))
 
 def main():
     # Test examples
@@ -54,6 +138,10 @@ def main():
 
     result = solve_part1(example_input)
     assert result == 2, f"Part 1 example failed! Got {result} expected 2"
+    result = solve_part2(example_input)
+    assert result == 4, f"Part 2 example failed! Got {result} expected 4"
+    result = solve_batched(example_input)
+    assert result == (2, 4), f"Batched example failed! Got {result} expected (2, 4)"
 
     # Solve actual puzzle
     load_dotenv()
@@ -64,8 +152,13 @@ def main():
     answer1 = solve_part1(input_data)
     print(f"Part 1: {answer1}")
 
+    # Part 2
+    answer2 = solve_part2(input_data)
+    print(f"Part 2: {answer2}")
+
     # Submit answer
-    client.submit_answer(2, 1, str(answer1))
+    response = client.submit_answer(2, 2, str(answer2))
+    print(f"Submission response: {response}")
 
 if __name__ == "__main__":
     main()
@@ -1,49 +1,45 @@
 from dotenv import load_dotenv
+import os
+import re
 import sys
+from multiprocessing import Pool, shared_memory
 from pathlib import Path
+import numpy as np
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.aoc_client import AocClient
+from utils.grid import Grid
 
-def find_xmas(grid: list[str], row: int, col: int) -> list[tuple[int, int, int, int]]:
-    """Check all 8 directions from a starting position for 'XMAS'."""
-    height, width = len(grid), len(grid[0])
-    directions = [
-        (0, 1),   # right
-        (1, 0),   # down
-        (1, 1),   # diagonal down-right
-        (-1, 1),  # diagonal up-right
-        (0, -1),  # left
-        (-1, 0),  # up
-        (-1, -1), # diagonal up-left
-        (1, -1),  # diagonal down-left
-    ]
+# Set AOC_TRACE=1 to print every candidate pattern. Checked once at import, and
+# every trace call sits behind `if TRACE:` so nothing is formatted when disabled.
+TRACE = os.getenv('AOC_TRACE') == '1'
 
-    found = []
-    for dy, dx in directions:
-        # Check if XMAS fits in this direction
-        if (0 <= row + 3*dy < height and
-            0 <= col + 3*dx < width and
-            grid[row][col] == 'X' and
-            grid[row + dy][col + dx] == 'M' and
-            grid[row + 2*dy][col + 2*dx] == 'A' and
-            grid[row + 3*dy][col + 3*dx] == 'S'):
-            found.append((row, col, row + 3*dy, col + 3*dx))
-    return found
+def count_occurrences(text: bytes, word: str) -> int:
+    """Count possibly overlapping occurrences of word in text."""
+    pattern = word.encode('ascii')
+    # bytes.count is much faster but skips overlaps, which only matter when a
+    # prefix of the word is also a suffix of it (e.g. 'AA' or 'ABA')
+    if not any(word[:k] == word[-k:] for k in range(1, len(word))):
+        return text.count(pattern)
+    return len(re.findall(b'(?=' + re.escape(pattern) + b')', text))
 
-def solve_part1(input_data: str) -> int:
-    # Convert input into grid
-    grid = input_data.strip().split('\n')
+def count_words(grid: Grid, words: list[str]) -> dict[str, int]:
+    """Count each word in all 8 directions, in time linear in the grid size per word."""
+    # Every row, column and diagonal, separated by the grid's sentinels
+    text = grid.lines()
+    return {
+        word: count_occurrences(text, word) + count_occurrences(text, word[::-1])
+        for word in words
+    }
 
-    # Search for XMAS in all directions from each starting position
-    all_xmas = []
-    for i in range(len(grid)):
-        for j in range(len(grid[0])):
-            all_xmas.extend(find_xmas(grid, i, j))
+def solve_part1(input_data: str) -> int:
+    return solve_part1_grid(Grid.from_text(input_data))
 
-    return len(all_xmas)
+def solve_part1_grid(grid: Grid) -> int:
+    # Search for XMAS along every row, column and diagonal in both directions
+    return count_words(grid, ['XMAS'])['XMAS']
 
 def find_xmas_part2(grid: list[str], row: int, col: int) -> list[tuple[int, int, int, int, int, int]]:
     """Check for X patterns where A is center, and each diagonal has M and S at ends."""
@@ -76,7 +72,7 @@ def find_xmas_part2(grid: list[str], row: int, col: int) -> list[tuple[int, int,
             end4 = grid[row - dy2][col - dx2]
 
             # Debug print for each potential pattern
-            if center == 'A':
+            if TRACE and center == 'A':
                 print(f"Checking at ({row}, {col}):")
                 print(f"  Center: {center}")
                 print(f"  Diagonal 1 ends: {end1}, {end2}")
@@ -102,17 +98,52 @@ def find_xmas_part2(grid: list[str], row: int, col: int) -> list[tuple[int, int,
             ])
             pattern = (row, col, *coords[0], *coords[1], *coords[2], *coords[3])
             found.append(pattern)
-            print(f"  Found valid pattern!")
+            if TRACE:
+                print(f"  Found valid pattern!")
     return found
 
+def xmas_mask(cells: np.ndarray) -> np.ndarray:
+    """
+    Mark every interior cell that is the centre of an X-MAS, using shifted
+    slices so each diagonal neighbour is compared for the whole grid at once.
+    """
+    m, a, s = ord('M'), ord('A'), ord('S')
+    up_left, down_right = cells[:-2, :-2], cells[2:, 2:]
+    up_right, down_left = cells[:-2, 2:], cells[2:, :-2]
+
+    diagonal1 = ((up_left == m) & (down_right == s)) | ((up_left == s) & (down_right == m))
+    diagonal2 = ((up_right == m) & (down_left == s)) | ((up_right == s) & (down_left == m))
+    return (cells[1:-1, 1:-1] == a) & diagonal1 & diagonal2
+
 def solve_part2(input_data: str) -> int:
+    return solve_part2_grid(Grid.from_text(input_data))
+
+def solve_part2_grid(grid: Grid) -> int:
+    if grid.height < 3 or grid.width < 3:
+        return 0
+
+    mask = xmas_mask(grid.array())
+
+    if TRACE:
+        print("\nGrid:")
+        for row in grid.array():
+            print(row.tobytes().decode('ascii'))
+        # Mask coordinates are offset by one from the grid's
+        for row, col in np.argwhere(mask) + 1:
+            print(f"Found X-MAS centred at ({row}, {col})")
+
+    return int(mask.sum())
+
+def solve_part2_loop(input_data: str) -> int:
+    """Cell-by-cell version of solve_part2, useful alongside AOC_TRACE."""
     # Convert input into grid
     grid = input_data.strip().split('\n')
 
-    print("\nGrid:")
-    for line in grid:
-        print(line)
-    print()
+    if TRACE:
+        print("\nGrid:")
+        for line in grid:
+            print(line)
+        print()
 
     # Search for X-MAS patterns from each starting position
     all_xmas = set()  # Using a set to avoid duplicates
@@ -122,9 +153,87 @@ def solve_part2(input_data: str) -> int:
             for pattern in patterns:
                 all_xmas.add(pattern)
 
-    print(f"\nTotal patterns found: {len(all_xmas)}")
+    if TRACE:
+        print(f"\nTotal patterns found: {len(all_xmas)}")
     return len(all_xmas)
 
+def count_word_in_rows(grid: Grid, word: str, start: int, end: int) -> int:
+    """
+    Count occurrences of word in all 8 directions whose first letter lies in
+    rows start..end-1. Only reads rows within len(word) - 1 of that range.
+    """
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    codes = word.encode('ascii')
+    reach = len(codes) - 1
+    # Flat indices of every cell in the rows, plus their trailing sentinels
+    lo, hi = grid.index(start, 0), grid.index(end, 0)
+
+    total = 0
+    for offset in grid.directions:
+        # A word that would run past either end of the buffer has already
+        # crossed the sentinel border, so those anchors can be skipped
+        span = reach * offset
+        first, last = max(lo, -span), min(hi, len(cells) - span)
+        if first >= last:
+            continue
+
+        mask = cells[first:last] == codes[0]
+        for k in range(1, len(codes)):
+            mask &= cells[first + k * offset:last + k * offset] == codes[k]
+        total += int(mask.sum())
+    return total
+
+# Grid view shared with the worker processes, set up by attach_shared_grid
+shared_grid = None
+
+def attach_shared_grid(name: str, width: int, height: int):
+    """Pool initializer: map the grid from shared memory without copying it."""
+    global shared_grid
+    memory = shared_memory.SharedMemory(name=name)
+    # The mapping can be rounded up to a whole page, so trim it to the grid
+    size = (width + 1) * (height + 2)
+    shared_grid = (memory, Grid(memory.buf[:size], width, height))
+
+def scan_band(band: tuple[int, int]) -> tuple[int, int]:
+    """Count XMAS words starting in, and X-MAS patterns centred in, a band of rows."""
+    start, end = band
+    grid = shared_grid[1]
+    cells = grid.array()
+    height = grid.height
+
+    part1 = count_word_in_rows(grid, 'XMAS', start, end)
+    # xmas_mask only reports centres one cell in from the edges, so hand it
+    # the band plus a one-row halo on each side
+    lo, hi = max(start - 1, 0), min(end + 1, height)
+    part2 = int(xmas_mask(cells[lo:hi]).sum()) if hi - lo >= 3 else 0
+    return part1, part2
+
+def solve_parallel(input_data: str, workers: int | None = None, band_rows: int | None = None) -> tuple[int, int]:
+    return solve_parallel_grid(Grid.from_text(input_data), workers, band_rows)
+
+def solve_parallel_grid(grid: Grid, workers: int | None = None, band_rows: int | None = None) -> tuple[int, int]:
+    """
+    Solve both parts by splitting the grid into row bands scanned in a process pool.
+    The grid is placed in shared memory once; each band reads up to 3 rows of
+    halo around it but only counts matches anchored in its own rows.
+    """
+    height, width = grid.height, grid.width
+    workers = workers or os.cpu_count() or 1
+    # A few bands per worker keeps the pool balanced
+    band_rows = band_rows or max(1, -(-height // (workers * 4)))
+    bands = [(start, min(start + band_rows, height)) for start in range(0, height, band_rows)]
+
+    memory = shared_memory.SharedMemory(create=True, size=len(grid.cells))
+    try:
+        memory.buf[:len(grid.cells)] = grid.cells
+        with Pool(workers, initializer=attach_shared_grid, initargs=(memory.name, width, height)) as pool:
+            counts = pool.map(scan_band, bands)
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
 def main():
     # Test examples
     example_input = """MMMSXXMASM
@@ -140,19 +249,23 @@ MXMXAXMASX"""
 
     assert solve_part1(example_input) == 18, "Part 1 example failed!"
     assert solve_part2(example_input) == 9, "Part 2 example failed!"
+    assert solve_part2_loop(example_input) == 9, "Part 2 loop example failed!"
+    assert solve_parallel(example_input, workers=2, band_rows=3) == (18, 9), "Parallel example failed!"
 
     # Solve actual puzzle
     load_dotenv()
     client = AocClient()
-    input_data = client.get_input(4)
+    # Make sure the input is cached, then load the grid straight from the file
+    client.get_input(4)
+    grid = Grid.from_file(client.cache_file(4))
 
     # Part 1
-    answer1 = solve_part1(input_data)
+    answer1 = solve_part1_grid(grid)
     print(f"Part 1: {answer1}")
     response = client.submit_answer(4, 1, answer1)
     print(f"Submission response: {response}")
     # Part 2 (when available)
-    answer2 = solve_part2(input_data)
+    answer2 = solve_part2_grid(grid)
     print(f"Part 2: {answer2}")
     response = client.submit_answer(4, 2, answer2)
     print(f"Submission response: {response}")
@@ -1,105 +1,185 @@
 from dotenv import load_dotenv
+import io
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import cmp_to_key
 from pathlib import Path
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Iterator, Optional, Set, TextIO, Tuple
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.aoc_client import AocClient
 
-def parse_input(input_data: str) -> Tuple[Dict[int, Set[int]], List[List[int]]]:
-    # Split into rules and updates sections
-    rules_section, updates_section = input_data.strip().split('\n\n')
-    
-    # Parse rules into graph of dependencies
+def parse_rules(lines: Iterator[str]) -> Dict[int, Set[int]]:
+    """Consume rule lines up to the blank line that ends the rules section."""
     # Key: page number, Value: set of pages that must come BEFORE this page
     dependencies = defaultdict(set)
-    for rule in rules_section.split('\n'):
-        before, after = map(int, rule.split('|'))
+    for line in lines:
+        line = line.strip()
+        if not line:
+            break
+        before, after = map(int, line.split('|'))
         dependencies[after].add(before)
+    return dependencies
+
+def parse_update(line: str) -> List[int]:
+    return list(map(int, line.split(',')))
+
+def parse_input(input_data: str) -> Tuple[Dict[int, Set[int]], List[List[int]]]:
+    lines = iter(input_data.strip().split('\n'))
+
+    # Parse rules into graph of dependencies, leaving lines at the updates section
+    dependencies = parse_rules(lines)
     
     # Parse updates into lists of page numbers
-    updates = []
-    for update in updates_section.split('\n'):
-        pages = list(map(int, update.split(',')))
-        updates.append(pages)
+    updates = [parse_update(line) for line in lines if line.strip()]
         
     return dependencies, updates
 
-def build_dependency_graphs(pages: List[int], dependencies: Dict[int, Set[int]]) -> Tuple[Dict[int, Set[int]], Dict[int, Set[int]]]:
-    """Build both before and after dependency graphs just for the pages in this update."""
-    before = defaultdict(set)  # things that must come before a page
-    after = defaultdict(set)   # things that must come after a page
-    
-    # For each page, check what must come before it
-    for page in pages:
-        for dep in dependencies[page]:
-            if dep in pages:  # Only include dependencies within our update
-                before[page].add(dep)
-                after[dep].add(page)
-    
-    return before, after
-
-def is_valid_order(pages: List[int], dependencies: Dict[int, Set[int]]) -> bool:
-    """Check if the order satisfies all dependencies."""
-    for i, page in enumerate(pages):
-        required_before = dependencies[page]
-        actual_before = set(pages[:i])
-        # Check if any required pages are missing from actual pages before this one
-        if not required_before.issubset(actual_before):
-            missing_required = required_before - actual_before
-            if any(req in pages for req in missing_required):
+class RuleIndex:
+    """
+    Ordering rules precomputed once and shared across all updates.
+    Page sets are stored as int bitsets (bit n set for page n), so checking
+    an update is a few integer operations per page.
+    """
+
+    def __init__(self, dependencies: Dict[int, Set[int]]):
+        self.dependencies = dependencies
+        # Key: page number, Value: bitset of pages that must come BEFORE it
+        self.before_mask = {
+            page: sum(1 << dep for dep in deps)
+            for page, deps in dependencies.items()
+        }
+        # Key: page number, Value: bitset of pages that must come AFTER it
+        self.after_mask = defaultdict(int)
+        for page, deps in dependencies.items():
+            for dep in deps:
+                self.after_mask[dep] |= 1 << page
+
+    @staticmethod
+    def mask(pages: List[int]) -> int:
+        """Return the bitset of the given pages."""
+        update_mask = 0
+        for page in pages:
+            update_mask |= 1 << page
+        return update_mask
+
+    def count_before(self, page: int, update_mask: int) -> int:
+        """Count the pages in update_mask that must come before page."""
+        return (self.before_mask.get(page, 0) & update_mask).bit_count()
+
+    def compare(self, a: int, b: int) -> int:
+        """Comparator for functools.cmp_to_key: negative if a must come before b."""
+        if self.before_mask.get(b, 0) >> a & 1:
+            return -1
+        if self.before_mask.get(a, 0) >> b & 1:
+            return 1
+        return 0
+
+    def is_valid(self, pages: List[int]) -> bool:
+        """Check if the order satisfies all rules between pages in the update, in O(n)."""
+        update_mask = self.mask(pages)
+        seen = 0
+        for page in pages:
+            # Pages in this update that must precede this one but haven't been seen yet
+            if self.before_mask.get(page, 0) & update_mask & ~seen:
                 return False
-    return True
+            seen |= 1 << page
+        return True
+
+    def topological_order(self, pages: List[int], in_degree: Dict[int, int], update_mask: int) -> List[int]:
+        """
+        Order pages with Kahn's algorithm, given each page's in-degree within
+        the update. Raises ValueError if the rules among the pages form a cycle.
+        """
+        in_degree = dict(in_degree)
+        ready = deque(page for page in pages if in_degree[page] == 0)
+        result = []
+
+        while ready:
+            page = ready.popleft()
+            result.append(page)
 
-def find_valid_order(pages: List[int], dependencies: Dict[int, Set[int]]) -> List[int]:
-    """Find a valid ordering of the pages that satisfies all dependencies."""
+            # Release the pages in this update that had to wait for this one
+            successors = self.after_mask[page] & update_mask
+            while successors:
+                lowest = successors & -successors
+                successor = lowest.bit_length() - 1
+                successors ^= lowest
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+
+        if len(result) < len(pages):
+            stuck = sorted(page for page in pages if in_degree[page] > 0)
+            raise ValueError(f"Ordering rules form a cycle among pages {stuck}")
+        return result
+
+def find_valid_order(pages: List[int], index: RuleIndex) -> List[int]:
+    """
+    Find a valid ordering of the pages that satisfies all rules between them.
+    Raises ValueError if the rules among these pages form a cycle.
+    """
     if len(pages) <= 1:
         return pages
-        
-    # Build both before and after dependency graphs
-    before_deps, after_deps = build_dependency_graphs(pages, dependencies)
-    
-    # Track which pages we've used
-    remaining = set(pages)
-    result = []
-    
-    while remaining:
-        # Find a page that has no remaining dependencies before it
-        # and maximizes the number of remaining pages that must come after it
-        best_page = None
-        max_after = -1
-        
-        for page in remaining:
-            # Count dependencies that must come before this page
-            before_count = sum(1 for p in before_deps[page] if p in remaining)
-            if before_count == 0:
-                # Count how many remaining pages must come after this one
-                after_count = sum(1 for p in after_deps[page] if p in remaining)
-                if after_count > max_after:
-                    max_after = after_count
-                    best_page = page
-        
-        if best_page is None:
-            # If we can't find a valid page, there must be a cycle
-            # Return pages in their original order
-            return pages
-            
-        result.append(best_page)
-        remaining.remove(best_page)
-    
-    return result
+
+    update_mask = index.mask(pages)
+    in_degree = {page: index.count_before(page, update_mask) for page in pages}
+
+    # If no pair of pages has rules in both directions, in-degrees of exactly
+    # 0..n-1 mean every pair has exactly one rule and the rules form a total
+    # order, so a plain comparison sort is enough
+    one_rule_per_pair = not any(
+        index.before_mask.get(page, 0) & index.after_mask[page] & update_mask for page in pages
+    )
+    if one_rule_per_pair and sorted(in_degree.values()) == list(range(len(pages))):
+        return sorted(pages, key=cmp_to_key(index.compare))
+
+    return index.topological_order(pages, in_degree, update_mask)
+
+def validate_stream(stream: TextIO) -> Iterator[Tuple[bool, Optional[int], Optional[str]]]:
+    """
+    Read the rules section from stream once, then handle update lines as they
+    arrive, yielding (was_valid, middle_page, error) for each. A fixed order's
+    middle page is reported for invalid updates. An update the rules can't
+    order is reported with its error and no middle page, and the stream goes
+    on. Only one update is held at a time.
+    """
+    index = RuleIndex(parse_rules(stream))
+    for line in stream:
+        if not line.strip():
+            continue
+        pages = parse_update(line)
+        valid = index.is_valid(pages)
+        if not valid:
+            try:
+                pages = find_valid_order(pages, index)
+            except ValueError as e:
+                yield False, None, f"{line.strip()}: {e}"
+                continue
+        yield valid, pages[len(pages) // 2], None
+
+def run_stream(stream: TextIO):
+    """Print a result line per update, plus running totals for both parts."""
+    totals = {True: 0, False: 0}
+    for valid, middle, error in validate_stream(stream):
+        if error:
+            print(f"error {error}", flush=True)
+            continue
+        totals[valid] += middle
+        status = "valid" if valid else "fixed"
+        print(f"{status} {middle} (part 1: {totals[True]}, part 2: {totals[False]})", flush=True)
 
 def solve_part1(input_data: str) -> int:
     # Parse input
     dependencies, updates = parse_input(input_data)
+    index = RuleIndex(dependencies)
     
     # Find valid updates and their middle numbers
     total = 0
     for update in updates:
-        if is_valid_order(update, dependencies):
+        if index.is_valid(update):
             middle_idx = len(update) // 2
             total += update[middle_idx]
             
@@ -108,13 +188,14 @@ def solve_part1(input_data: str) -> int:
 def solve_part2(input_data: str) -> int:
     # Parse input
     dependencies, updates = parse_input(input_data)
+    index = RuleIndex(dependencies)
     
     # Find invalid updates and fix their order
     total = 0
     for update in updates:
-        if not is_valid_order(update, dependencies):
+        if not index.is_valid(update):
             # Find valid ordering for this update
-            fixed_order = find_valid_order(update, dependencies)
+            fixed_order = find_valid_order(update, index)
             # Add middle number
             middle_idx = len(fixed_order) // 2
             total += fixed_order[middle_idx]
@@ -122,6 +203,16 @@ def solve_part2(input_data: str) -> int:
     return total
 
 def main():
+    # Streaming mode: python solve.py --stream [file], reading stdin if no file is given
+    if '--stream' in sys.argv:
+        args = sys.argv[sys.argv.index('--stream') + 1:]
+        if args:
+            with open(args[0]) as stream:
+                run_stream(stream)
+        else:
+            run_stream(sys.stdin)
+        return
+
     # Test examples
     example_input = """47|53
 97|13
@@ -154,6 +245,19 @@ def main():
 
     assert solve_part1(example_input) == 143, "Part 1 example failed!"
     assert solve_part2(example_input) == 123, "Part 2 example failed!"
+    results = list(validate_stream(io.StringIO(example_input)))
+    assert sum(m for valid, m, _ in results if valid) == 143, "Stream part 1 example failed!"
+    assert sum(m for valid, m, _ in results if not valid) == 123, "Stream part 2 example failed!"
+    # 2 and 3 must each come before the other, so no order exists
+    cyclic_index = RuleIndex({3: {1, 2}, 2: {3}})
+    try:
+        find_valid_order([1, 2, 3], cyclic_index)
+        assert False, "Cyclic update example failed!"
+    except ValueError:
+        pass
+    # A cyclic update is reported and the stream carries on to the next one
+    results = list(validate_stream(io.StringIO("1|3\n2|3\n3|2\n\n1,2,3\n75,47\n")))
+    assert results[0][2] is not None and results[1] == (True, 47, None), "Stream cyclic example failed!"
     
     # Solve actual puzzle
     load_dotenv()
@@ -1,133 +1,246 @@
 from dotenv import load_dotenv
+import os
 import sys
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Set, Tuple, Optional
-from copy import deepcopy
+from array import array
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.aoc_client import AocClient
+from utils.grid import Grid, SENTINEL
 
-def parse_map(input_data: str) -> tuple[list[str], tuple[int, int, str]]:
-    """Parse the input map and return the grid and guard starting position with direction."""
-    lines = input_data.strip().split('\n')
-    grid = []
-    guard_pos = None
-    
-    for i, line in enumerate(lines):
-        row = list(line)
-        if '^' in line or '>' in line or 'v' in line or '<' in line:
-            j = line.find('^')
-            if j != -1:
-                guard_pos = (i, j, '^')
-            j = line.find('>')
-            if j != -1:
-                guard_pos = (i, j, '>')
-            j = line.find('v')
-            if j != -1:
-                guard_pos = (i, j, 'v')
-            j = line.find('<')
-            if j != -1:
-                guard_pos = (i, j, '<')
-            row[guard_pos[1]] = '.'  # Replace guard with empty space
-        grid.append(row)
-    
-    return grid, guard_pos
-
-def get_next_pos(pos: tuple[int, int], direction: str) -> tuple[int, int]:
-    """Get the next position based on current position and direction."""
-    row, col = pos
-    if direction == '^':
-        return (row - 1, col)
-    elif direction == '>':
-        return (row, col + 1)
-    elif direction == 'v':
-        return (row + 1, col)
-    else:  # '<'
-        return (row, col - 1)
-
-def turn_right(direction: str) -> str:
-    """Return the new direction after turning right 90 degrees."""
-    return {'^': '>', '>': 'v', 'v': '<', '<': '^'}[direction]
-
-def simulate_guard(grid: list[str], start_pos: tuple[int, int, str], detect_loop: bool = False, max_steps: int = 10000) -> Optional[set[tuple[int, int]]]:
+WALL = ord('#')
+
+# Guard directions in clockwise order, so turning right is (d + 1) % 4
+DIRECTIONS = '^>v<'
+
+def find_guard(grid: Grid) -> tuple[int, int]:
+    """Return the guard's starting cell index and direction (0-3)."""
+    for d, symbol in enumerate(DIRECTIONS):
+        guard = grid.find(symbol)
+        if guard != -1:
+            return guard, d
+    raise ValueError("No guard found on the map")
+
+def build_jump_table(grid: Grid) -> list[array]:
     """
-    Simulate guard movement and return set of visited positions.
-    If detect_loop is True, returns None if guard exits the map.
+    For each direction and cell, precompute where the guard stops when walking
+    straight from that cell: the last free cell before the next obstacle, or
+    -1 if the guard walks off the map.
     """
-    height, width = len(grid), len(grid[0])
-    visited = {(start_pos[0], start_pos[1])}
-    
-    # Only track state history if we're detecting loops
-    state_history = {(start_pos[0], start_pos[1], start_pos[2])} if detect_loop else set()
-    
-    # Current state
-    row, col = start_pos[0], start_pos[1]
-    direction = start_pos[2]
-    
-    for _ in range(max_steps):
-        # Check if position in front is blocked or out of bounds
-        next_row, next_col = get_next_pos((row, col), direction)
-        
-        if (next_row < 0 or next_row >= height or 
-            next_col < 0 or next_col >= width or 
-            grid[next_row][next_col] == '#'):
-            # Turn right
-            direction = turn_right(direction)
+    cells, stride = grid.cells, grid.stride
+    up, right, down, left = jumps = [array('i', [-1]) * len(cells) for _ in DIRECTIONS]
+
+    # Every cell in a run between obstacles stops at the same cell in each
+    # direction, so whole runs are filled with one slice assignment. Each line
+    # is (first position, step, length, backward table, forward table).
+    rows = [(grid.index(row, 0), 1, grid.width, left, right) for row in range(grid.height)]
+    columns = [(grid.index(0, col), stride, grid.height, up, down) for col in range(grid.width)]
+    for first, step, length, backward, forward in rows + columns:
+        line = cells[first:first + step * length:step]
+        run_start = 0
+        while run_start < length:
+            wall = line.find(WALL, run_start)
+            run_end = length if wall == -1 else wall
+            if run_end > run_start:
+                run = slice(first + run_start * step, first + run_end * step, step)
+                count = run_end - run_start
+                # Walking backward stops at the run's first cell, unless it starts at the edge
+                backward[run] = array('i', [first + run_start * step if run_start > 0 else -1]) * count
+                forward[run] = array('i', [first + (run_end - 1) * step if wall != -1 else -1]) * count
+            run_start = run_end + 1
+    return jumps
+
+def next_stop(jumps: list[array], pos: int, d: int, offsets: tuple[int, int, int, int], obstacle: int = -1) -> int:
+    """
+    Where the guard stops walking in direction d from pos, or -1 if they leave
+    the map. An extra obstacle can be overlaid without changing the table.
+    offsets are the grid's orthogonal step offsets.
+    """
+    stop = jumps[d][pos]
+    if obstacle >= 0:
+        # Horizontal moves need the obstacle in the same row, vertical ones in the same column
+        stride = offsets[2]
+        if d & 1:
+            in_line = obstacle // stride == pos // stride
         else:
-            # Move forward
-            row, col = next_row, next_col
-            visited.add((row, col))
-            
-            # Check if we've left the map
-            if row == height - 1 or row == 0 or col == width - 1 or col == 0:
-                if detect_loop:
-                    return None
-                break
-            
-            # Check for loop if we're detecting them
-            if detect_loop:
-                state = (row, col, direction)
-                if state in state_history:
-                    return visited
-                state_history.add(state)
-    
-    return visited
-
-def solve_part1(input_data: str) -> int:
-    # Parse input
-    grid, guard_start = parse_map(input_data)
-    visited = simulate_guard(grid, guard_start)
-    return len(visited)
-
-def solve_part2(input_data: str) -> int:
-    # Parse input
-    grid, guard_start = parse_map(input_data)
-    height, width = len(grid), len(grid[0])
-    
-    # Try each possible position for new obstacle
-    valid_positions = 0
-    
-    for row in range(height):
-        for col in range(width):
-            # Skip if position is already occupied or is guard start
-            if (grid[row][col] != '.' or 
-                (row == guard_start[0] and col == guard_start[1])):
-                continue
-            
-            # Try adding obstacle here
-            new_grid = deepcopy(grid)
-            new_grid[row][col] = '#'
-            
-            # Simulate guard movement with loop detection
-            result = simulate_guard(new_grid, guard_start, detect_loop=True)
-            
-            # If we got a result (not None), it means guard got stuck in a loop
-            if result is not None:
-                valid_positions += 1
-    
-    return valid_positions
+            in_line = obstacle % stride == pos % stride
+        if in_line:
+            step = offsets[d]
+            distance = (obstacle - pos) // step
+            if distance > 0 and (stop < 0 or distance <= (stop - pos) // step):
+                stop = obstacle - step
+    return stop
+
+def check_turn_limit(turns: int, max_turns: int | None):
+    """Raise if a simulation has exceeded its optional safety limit on turns."""
+    if max_turns is not None and turns > max_turns:
+        raise RuntimeError(f"Guard made more than {max_turns} turns without leaving the map or looping")
+
+def walk_path(grid: Grid, guard: int, d: int, jumps: list[array], max_turns: int | None = None) -> tuple[bytearray, array, bool]:
+    """
+    Walk the guard's original path. Returns a per-cell visited flag, the state
+    (pos * 4 + direction) the guard was in just before first stepping into
+    each cell (-1 for cells never entered, and for the start), and whether the
+    path is a loop.
+    """
+    cells = grid.cells
+    size = len(cells)
+    offsets = grid.orthogonal
+    visited = bytearray(size)
+    entries = array('i', [-1]) * size
+    # Per-cell bitmask of the directions the guard was facing when turning there
+    turned = bytearray(size)
+
+    pos = guard
+    visited[pos] = 1
+    turns = 0
+    while True:
+        step = offsets[d]
+        stop = jumps[d][pos]
+        end = stop
+        if stop < 0:
+            # Nothing ahead: walk on until the next step would hit the border
+            end = pos
+            while cells[end + step] != SENTINEL:
+                end += step
+        for cell in range(pos + step, end + step, step):
+            if not visited[cell]:
+                visited[cell] = 1
+                entries[cell] = (cell - step) * 4 + d
+
+        if stop < 0:
+            return visited, entries, False
+        pos = stop
+        if turned[pos] >> d & 1:
+            return visited, entries, True
+        turned[pos] |= 1 << d
+        d = (d + 1) & 3
+        turns += 1
+        check_turn_limit(turns, max_turns)
+
+def simulate_guard(jumps: list[array], offsets: tuple[int, int, int, int], pos: int, d: int, obstacle: int, seen: bytearray,
+                   max_turns: int | None = None) -> bool:
+    """
+    Simulate the guard from pos facing d with an extra obstacle, and return
+    whether they end up in a loop. Each straight segment is one jump table
+    lookup and loops are detected on turns only, recorded in seen as a
+    per-cell direction bitmask. seen must be all zero on entry and is left
+    all zero on return: only the cells turned at are reset, so a trial costs
+    O(turns) rather than O(cells).
+
+    Detection is exact: there are only 4 turn states per cell, so the guard
+    either leaves or repeats one within 4 * cells turns. max_turns is an
+    optional lower safety limit that raises RuntimeError when exceeded.
+    """
+    turns = 0
+    turned_at = []
+    try:
+        while True:
+            stop = next_stop(jumps, pos, d, offsets, obstacle)
+            if stop < 0:
+                return False
+            pos = stop
+
+            # Blocked: if we've already turned here facing this way, we're in a loop
+            bit = 1 << d
+            if seen[pos] & bit:
+                return True
+            if not seen[pos]:
+                turned_at.append(pos)
+            seen[pos] |= bit
+            d = (d + 1) & 3
+            turns += 1
+            check_turn_limit(turns, max_turns)
+    finally:
+        for cell in turned_at:
+            seen[cell] = 0
+
+def solve_part1(input_data: str, max_turns: int | None = None) -> int:
+    return solve_part1_grid(Grid.from_text(input_data), max_turns)
+
+def solve_part1_grid(grid: Grid, max_turns: int | None = None) -> int:
+    guard, d = find_guard(grid)
+    # The guard's cell is empty floor once they've left it
+    with grid.overlay({guard: '.'}):
+        visited, _, _ = walk_path(grid, guard, d, build_jump_table(grid), max_turns)
+    return visited.count(1)
+
+def prepare_trials(grid: Grid, max_turns: int | None = None) -> tuple[list[array], tuple[int, int, int, int], array, int]:
+    """
+    Set up part 2: returns the jump table, grid step offsets, the candidate trials as
+    flattened (obstacle, state before) pairs, and the number of positions that
+    are known to cause a loop without a trial.
+    """
+    guard, d = find_guard(grid)
+    with grid.overlay({guard: '.'}):
+        jumps = build_jump_table(grid)
+
+        # An obstacle can only change the route if the guard would walk into it,
+        # so only cells on the original path are candidates
+        visited, entries, already_loops = walk_path(grid, guard, d, jumps, max_turns)
+        known_loops = 0
+        if already_loops:
+            # Any obstacle off the path leaves the existing loop intact
+            known_loops = grid.count('.') - visited.count(1)
+
+    candidates = array('i')
+    for obstacle, before in enumerate(entries):
+        if before >= 0:
+            candidates.extend((obstacle, before))
+    return jumps, grid.orthogonal, candidates, known_loops
+
+def count_loops(jumps: list[array], offsets: tuple[int, int, int, int], candidates: array, max_turns: int | None = None) -> int:
+    """Count the candidate obstacles, as flattened (obstacle, state before) pairs, that trap the guard."""
+    # Turn bitmask reused by every trial; simulate_guard clears what it sets
+    seen = bytearray(len(jumps[0]))
+
+    loops = 0
+    for i in range(0, len(candidates), 2):
+        obstacle, before = candidates[i], candidates[i + 1]
+        # The route up to the guard's first arrival at the obstacle is unchanged,
+        # so resume from just before it instead of from the start
+        if simulate_guard(jumps, offsets, before >> 2, before & 3, obstacle, seen, max_turns):
+            loops += 1
+    return loops
+
+def solve_part2(input_data: str, max_turns: int | None = None) -> int:
+    return solve_part2_grid(Grid.from_text(input_data), max_turns)
+
+def solve_part2_grid(grid: Grid, max_turns: int | None = None) -> int:
+    jumps, offsets, candidates, known_loops = prepare_trials(grid, max_turns)
+    return known_loops + count_loops(jumps, offsets, candidates, max_turns)
+
+# Jump table and settings for worker processes, set up by init_worker
+worker_state = None
+
+def init_worker(jumps: list[array], offsets: tuple[int, int, int, int], max_turns: int | None):
+    """Pool initializer: receive the jump table once per worker rather than per task."""
+    global worker_state
+    worker_state = (jumps, offsets, max_turns)
+
+def count_loops_in_chunk(candidates: array) -> int:
+    jumps, offsets, max_turns = worker_state
+    return count_loops(jumps, offsets, candidates, max_turns)
+
+def solve_part2_parallel(input_data: str, workers: int | None = None, chunk_size: int | None = None,
+                         max_turns: int | None = None) -> int:
+    return solve_part2_parallel_grid(Grid.from_text(input_data), workers, chunk_size, max_turns)
+
+def solve_part2_parallel_grid(grid: Grid, workers: int | None = None, chunk_size: int | None = None,
+                              max_turns: int | None = None) -> int:
+    """Solve part 2 with the obstacle trials split into chunks across a process pool."""
+    jumps, offsets, candidates, known_loops = prepare_trials(grid, max_turns)
+    workers = workers or os.cpu_count() or 1
+    trials = len(candidates) // 2
+    # A few chunks per worker keeps the pool balanced, since trial lengths vary
+    chunk_size = chunk_size or max(1, -(-trials // (workers * 8)))
+    chunks = [candidates[i:i + 2 * chunk_size] for i in range(0, len(candidates), 2 * chunk_size)]
+
+    with Pool(workers, initializer=init_worker, initargs=(jumps, offsets, max_turns)) as pool:
+        return known_loops + sum(pool.map(count_loops_in_chunk, chunks))
 
 def main():
     # Test example
@@ -143,18 +256,21 @@ def main():
 ......#..."""
     assert solve_part1(example_input) == 41, "Part 1 example failed!"
     assert solve_part2(example_input) == 6, "Part 2 example failed!"
+    assert solve_part2_parallel(example_input, workers=2, chunk_size=4) == 6, "Parallel part 2 example failed!"
     
     # Solve actual puzzle
     load_dotenv()
     client = AocClient()
-    input_data = client.get_input(6)
+    # Make sure the input is cached, then load the grid straight from the file
+    client.get_input(6)
+    grid = Grid.from_file(client.cache_file(6))
     
     # Part 1
-    answer1 = solve_part1(input_data)
+    answer1 = solve_part1_grid(grid)
     print(f"Part 1: {answer1}")
     
     # Part 2
-    answer2 = solve_part2(input_data)
+    answer2 = solve_part2_grid(grid)
     print(f"Part 2: {answer2}")
     
     # Submit answer
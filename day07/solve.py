@@ -1,41 +1,119 @@
 from dotenv import load_dotenv
+import heapq
+import os
 import sys
+import time
+from multiprocessing import Pool
 from pathlib import Path
-from itertools import product
+from typing import Callable, NamedTuple, Optional
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.aoc_client import AocClient
 
-def evaluate_expression(nums, operators):
-    """Evaluate expression from left to right"""
-    result = nums[0]
-    for i, op in enumerate(operators):
-        if op == '+':
-            result += nums[i + 1]
-        elif op == '*':
-            result *= nums[i + 1]
-        else:  # op == '||'
-            # Convert both numbers to strings, concatenate, then back to int
-            result = int(str(result) + str(nums[i + 1]))
-    return result
-
-def can_make_target(target: int, nums: list[int], use_concat: bool = False) -> bool:
-    """Check if target can be made from nums using operators"""
-    num_operators = len(nums) - 1
-    operators = ['+', '*']
-    if use_concat:
-        operators.append('||')
-    # Try all possible combinations of operators
-    for ops in product(operators, repeat=num_operators):
-        try:
-            if evaluate_expression(nums, ops) == target:
+class Operator(NamedTuple):
+    """An equation operator: forward evaluation plus optional hooks for faster search."""
+    symbol: str
+    # left, right -> result
+    apply: Callable[[int, int], int]
+    # result, right -> left, None if no left operand could produce result, or
+    # ANY_LEFT if every left operand would
+    invert: Optional[Callable[[int, int], Optional[int]]] = None
+    # Bound check: True if the result is never smaller than the left operand
+    # when the right operand is positive, so values past the target can be pruned
+    non_decreasing: bool = False
+
+# Returned by Operator.invert when the result doesn't depend on the left operand
+ANY_LEFT = object()
+
+# Operators by symbol; add new ones with register_operator
+OPERATORS: dict[str, Operator] = {}
+
+def register_operator(operator: Operator) -> Operator:
+    OPERATORS[operator.symbol] = operator
+    return operator
+
+def digit_shift(n: int) -> int:
+    """The power of ten with one more digit than n, i.e. what a || n multiplies a by."""
+    shift = 10
+    while shift <= n:
+        shift *= 10
+    return shift
+
+def concat(a: int, b: int) -> int:
+    """Arithmetic equivalent of int(str(a) + str(b))."""
+    if b < 0:
+        raise ValueError(f"Cannot concatenate negative number {b}")
+    shift = digit_shift(b)
+    return a * shift + b if a >= 0 else a * shift - b
+
+def unconcat(value: int, b: int) -> Optional[int]:
+    shift = digit_shift(b)
+    return value // shift if value >= 0 and value % shift == b else None
+
+def undo_multiply(value: int, b: int):
+    if b == 0:
+        # x * 0 == 0 for any x
+        return ANY_LEFT if value == 0 else None
+    return value // b if value % b == 0 else None
+
+register_operator(Operator('+', lambda a, b: a + b, lambda value, b: value - b, non_decreasing=True))
+register_operator(Operator('*', lambda a, b: a * b, undo_multiply, non_decreasing=True))
+register_operator(Operator('||', concat, unconcat, non_decreasing=True))
+
+# Operators allowed in each part of the puzzle
+PART1_OPERATORS = ['+', '*']
+PART2_OPERATORS = ['+', '*', '||']
+
+def can_make_target_with(target: int, nums: list[int], symbols: list[str]) -> bool:
+    """
+    Check if target can be made from nums using the registered operators in symbols.
+
+    When every operator has an inverse and no number is negative, search
+    backwards from the target, pruning wherever an inverse doesn't exist.
+    Otherwise search forwards depth-first: each partial value is computed once
+    and shared by every operator sequence with that prefix, and when every
+    operator is non-decreasing, branches stop as soon as they pass the target.
+    """
+    operators = [OPERATORS[symbol] for symbol in symbols]
+    positive = all(n > 0 for n in nums)
+
+    if all(n >= 0 for n in nums) and all(op.invert is not None for op in operators):
+        def backward(value: int, i: int) -> bool:
+            """Can nums[0..i] make value?"""
+            if i == 0:
+                return value == nums[0]
+            # Non-negative operands can never make a negative value
+            if value < 0:
+                return False
+            for op in operators:
+                left = op.invert(value, nums[i])
+                # The operands before nums[i] always make some value, so any will do
+                if left is ANY_LEFT:
+                    return True
+                if left is not None and backward(left, i - 1):
+                    return True
+            return False
+        return backward(target, len(nums) - 1)
+
+    prune = positive and all(op.non_decreasing for op in operators)
+
+    def forward(value: int, i: int) -> bool:
+        """Can value, combined with nums[i:], make target?"""
+        if i == len(nums):
+            return value == target
+        if prune and value > target:
+            return False
+        for op in operators:
+            try:
+                result = op.apply(value, nums[i])
+            except ValueError:
+                continue
+            if forward(result, i + 1):
                 return True
-        except ValueError:
-            # Skip if we create a number too large for int
-            continue
-    return False
+        return False
+    return forward(nums[0], 1)
 
 def parse_line(line: str) -> tuple[int, list[int]]:
     """Parse a line into target value and list of numbers"""
@@ -52,7 +130,7 @@ def solve_part1(input_data: str) -> int:
     total = 0
     for line in lines:
         target, nums = parse_line(line)
-        if can_make_target(target, nums):
+        if can_make_target_with(target, nums, PART1_OPERATORS):
             total += target
     
     return total
@@ -65,11 +143,69 @@ def solve_part2(input_data: str) -> int:
     total = 0
     for line in lines:
         target, nums = parse_line(line)
-        if can_make_target(target, nums, use_concat=True):
+        if can_make_target_with(target, nums, PART2_OPERATORS):
             total += target
     
     return total
 
+def solve_equation(target: int, nums: list[int]) -> tuple[int, int]:
+    """
+    Return what this equation adds to the part 1 and part 2 totals. Anything
+    solvable with + and * is also solvable once || is allowed, so the slower
+    part 2 search only runs for equations that fail part 1.
+    """
+    if can_make_target_with(target, nums, PART1_OPERATORS):
+        return target, target
+    if can_make_target_with(target, nums, PART2_OPERATORS):
+        return 0, target
+    return 0, 0
+
+def equation_weight(nums: list[int]) -> int:
+    """Worst-case number of operator combinations, used to balance work between chunks."""
+    return 3 ** (len(nums) - 1)
+
+def balanced_chunks(equations: list[tuple[int, list[int]]], count: int) -> list[list[tuple[int, list[int]]]]:
+    """Split equations into count chunks of roughly equal total weight, heaviest first."""
+    chunks = [[] for _ in range(count)]
+    loads = [(0, i) for i in range(count)]
+    for equation in sorted(equations, key=lambda eq: equation_weight(eq[1]), reverse=True):
+        load, i = heapq.heappop(loads)
+        chunks[i].append(equation)
+        heapq.heappush(loads, (load + equation_weight(equation[1]), i))
+    return [chunk for chunk in chunks if chunk]
+
+def solve_chunk(equations: list[tuple[int, list[int]]]) -> tuple[int, int, int, int, float]:
+    """Pool task: returns (part 1 total, part 2 total, worker pid, equations solved, seconds)."""
+    start = time.perf_counter()
+    part1 = part2 = 0
+    for target, nums in equations:
+        a, b = solve_equation(target, nums)
+        part1 += a
+        part2 += b
+    return part1, part2, os.getpid(), len(equations), time.perf_counter() - start
+
+def solve_parallel(input_data: str, workers: int | None = None) -> tuple[int, int, dict[int, tuple[int, float]]]:
+    """
+    Parse once and solve both parts in a single pass over a process pool.
+    Returns both totals and, per worker pid, the equations it solved and the
+    seconds it spent solving them.
+    """
+    equations = [parse_line(line) for line in input_data.strip().split('\n')]
+    workers = workers or os.cpu_count() or 1
+    chunks = balanced_chunks(equations, workers * 4)
+
+    with Pool(workers) as pool:
+        results = pool.map(solve_chunk, chunks)
+
+    part1 = part2 = 0
+    worker_stats = {}
+    for a, b, pid, count, seconds in results:
+        part1 += a
+        part2 += b
+        solved, busy = worker_stats.get(pid, (0, 0.0))
+        worker_stats[pid] = (solved + count, busy + seconds)
+    return part1, part2, worker_stats
+
 def main():
     # Test examples
     example_input = """190: 10 19
@@ -81,21 +217,29 @@ def main():
 192: 17 8 14
 21037: 9 7 18 13
 292: 11 6 16 20"""
+    equations = [parse_line(line) for line in example_input.split('\n')]
+    assert sum(t for t, nums in equations if can_make_target_with(t, nums, PART1_OPERATORS)) == 3749, "Registry part 1 example failed!"
+    assert sum(t for t, nums in equations if can_make_target_with(t, nums, PART2_OPERATORS)) == 11387, "Registry part 2 example failed!"
+    # A zero operand still takes the backward search
+    assert can_make_target_with(0, [5, 0] + [7] * 16, PART1_OPERATORS), "Zero operand example failed!"
+    assert not can_make_target_with(1, [5, 0] + [7] * 16, PART1_OPERATORS), "Zero operand example failed!"
+    assert can_make_target_with(12, [3, 0, 4], PART2_OPERATORS), "Zero operand example failed!"
     assert solve_part1(example_input) == 3749, "Part 1 example failed!"
     assert solve_part2(example_input) == 11387, "Part 2 example failed!"
+    assert solve_parallel(example_input, workers=2)[:2] == (3749, 11387), "Parallel example failed!"
     
     # Solve actual puzzle
     load_dotenv()
     client = AocClient()
     input_data = client.get_input(7)
     
-    # Part 1
-    answer1 = solve_part1(input_data)
+    # Both parts in one pass
+    answer1, answer2, worker_stats = solve_parallel(input_data)
     print(f"Part 1: {answer1}")
-    
-    # Part 2
-    answer2 = solve_part2(input_data)
     print(f"Part 2: {answer2}")
+    for pid, (solved, seconds) in sorted(worker_stats.items()):
+        rate = solved / seconds if seconds else float('inf')
+        print(f"Worker {pid}: {solved} equations in {seconds:.3f}s ({rate:.0f}/s)")
     
     # Submit part 2
     response = client.submit_answer(7, 2, str(answer2))
@@ -0,0 +1,98 @@
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class ToolStats:
+    """Call counts, latency histogram and per-phase timings for a single tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = 0.0
+        # One count per bucket in LATENCY_BUCKETS, plus an overflow bucket
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        # Phase name -> [count, total seconds]
+        self.phases: dict[str, list] = {}
+
+    def record_call(self, elapsed: float, error: bool = False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total_time += elapsed
+        self.min_time = elapsed if self.min_time is None else min(self.min_time, elapsed)
+        self.max_time = max(self.max_time, elapsed)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def record_phases(self, timings: dict[str, float]):
+        for phase, elapsed in timings.items():
+            stats = self.phases.setdefault(phase, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": round(self.total_time, 6),
+            "mean_seconds": round(self.total_time / self.calls, 6) if self.calls else 0.0,
+            "min_seconds": round(self.min_time or 0.0, 6),
+            "max_seconds": round(self.max_time, 6),
+            "latency_histogram": dict(zip(labels, self.histogram)),
+            "phases": {
+                phase: {
+                    "count": count,
+                    "total_seconds": round(total, 6),
+                    "mean_seconds": round(total / count, 6),
+                }
+                for phase, (count, total) in self.phases.items()
+            },
+        }
+
+class Metrics:
+    """Collects per-tool statistics for the lifetime of the server."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.tools: dict[str, ToolStats] = {}
+
+    def tool(self, name: str) -> ToolStats:
+        return self.tools.setdefault(name, ToolStats())
+
+    @contextmanager
+    def track(self, name: str):
+        """Time a tool call, counting it as an error if it raises."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield self.tool(name)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.tool(name).record_call(time.perf_counter() - start, error)
+
+    def snapshot(self) -> dict:
+        uptime = time.time() - self.started
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "tools": {
+                name: {**stats.to_dict(), "calls_per_second": round(stats.calls / uptime, 6)}
+                for name, stats in sorted(self.tools.items())
+            },
+        }
+
+    def dump(self, path: str | Path):
+        """Write a JSON snapshot of the metrics to a file."""
+        Path(path).write_text(json.dumps(self.snapshot(), indent=2))
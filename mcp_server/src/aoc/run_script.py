@@ -3,7 +3,9 @@ import tempfile
 import shutil
 from pathlib import Path
 import os
+import time
 import uuid
+from contextlib import contextmanager
 
 DOCKERFILE_TEMPLATE = '''
 FROM python:3.12-slim
@@ -18,17 +20,30 @@ COPY . /aoc/
 ENV PYTHONUNBUFFERED=1
 '''
 
-def run_script(script_path: str, timeout: int = 15) -> tuple[str, str]:
+def run_script(script_path: str, timeout: int = 15, timings: dict[str, float] | None = None) -> tuple[str, str]:
     """
     Run a Python script in a Docker container with network access.
 
     Args:
         script_path: Path to the script relative to AOC root
         timeout: Maximum execution time in seconds
+        timings: Optional dict to fill with seconds spent in the copy, build,
+            run and cleanup phases
 
     Returns:
         tuple[str, str]: (stdout, stderr)
     """
+    if timings is None:
+        timings = {}
+
+    @contextmanager
+    def phase(name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
     aoc_root = Path("/Users/rictic/open/aoc2024")
     full_script_path = (aoc_root / script_path).resolve()
 
@@ -56,53 +71,57 @@ def run_script(script_path: str, timeout: int = 15) -> tuple[str, str]:
                 n.endswith('.pyc')       # Compiled Python files
             ]
 
-        shutil.copytree(
-            aoc_root,
-            temp_path / "aoc",
-            ignore=ignore_patterns,
-            dirs_exist_ok=True
-        )
+        with phase("copy"):
+            shutil.copytree(
+                aoc_root,
+                temp_path / "aoc",
+                ignore=ignore_patterns,
+                dirs_exist_ok=True
+            )
 
-        # Create Dockerfile
-        (temp_path / "aoc" / "Dockerfile").write_text(DOCKERFILE_TEMPLATE)
+            # Create Dockerfile
+            (temp_path / "aoc" / "Dockerfile").write_text(DOCKERFILE_TEMPLATE)
 
         # Generate unique container name
         container_name = f"aoc-runner-{uuid.uuid4().hex[:8]}"
 
         try:
             # Build Docker image
-            subprocess.run(
-                ["docker", "build", "-t", container_name, "./aoc"],
-                cwd=temp_path,
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            with phase("build"):
+                subprocess.run(
+                    ["docker", "build", "-t", container_name, "./aoc"],
+                    cwd=temp_path,
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
 
             # Run script in container using uv
-            result = subprocess.run(
-                [
-                    "docker", "run",
-                    "--name", container_name,
-                    "--network", "host",  # Allow network access
-                    "--rm",  # Remove container after execution
-                    container_name,
-                    "uv",
-                    "--directory", "/aoc/mcp_server",
-                    "run",
-                    container_path
-                ],
-                timeout=timeout,
-                capture_output=True,
-                text=True
-            )
+            with phase("run"):
+                result = subprocess.run(
+                    [
+                        "docker", "run",
+                        "--name", container_name,
+                        "--network", "host",  # Allow network access
+                        "--rm",  # Remove container after execution
+                        container_name,
+                        "uv",
+                        "--directory", "/aoc/mcp_server",
+                        "run",
+                        container_path
+                    ],
+                    timeout=timeout,
+                    capture_output=True,
+                    text=True
+                )
 
             return result.stdout, result.stderr
 
         except subprocess.TimeoutExpired as e:
             # Clean up container if it's still running
-            subprocess.run(["docker", "stop", container_name], capture_output=True)
-            subprocess.run(["docker", "rm", container_name], capture_output=True)
+            with phase("cleanup"):
+                subprocess.run(["docker", "stop", container_name], capture_output=True)
+                subprocess.run(["docker", "rm", container_name], capture_output=True)
             return (
                 e.stdout.decode() if e.stdout else "",
                 f"Script execution timed out after {timeout} seconds\n" +
@@ -117,7 +136,8 @@ def run_script(script_path: str, timeout: int = 15) -> tuple[str, str]:
 
         finally:
             # Clean up Docker image
-            subprocess.run(["docker", "rmi", container_name], capture_output=True)
+            with phase("cleanup"):
+                subprocess.run(["docker", "rmi", container_name], capture_output=True)
 
 if __name__ == "__main__":
     # Test with day01/solve.py when run directly
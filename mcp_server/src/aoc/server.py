@@ -1,9 +1,11 @@
 import asyncio
+import json
 from pathlib import Path
 import sys
 from dotenv import load_dotenv
 import subprocess
 import signal
+import os
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent.parent.parent
@@ -16,6 +18,7 @@ from pydantic import AnyUrl
 import mcp.server.stdio
 from utils.aoc_client import AocClient
 from .run_script import run_script
+from .metrics import Metrics, ToolStats
 
 # Load environment variables from project root
 load_dotenv(project_root / '.env')
@@ -25,6 +28,94 @@ client = AocClient()
 
 server = Server("aoc")
 
+# Per-tool call counts, latencies and phase timings
+metrics = Metrics()
+
+RESOURCE_KINDS = {
+    "input": "Puzzle input",
+    "puzzle": "Puzzle text",
+    "results": "Submitted answers and responses",
+}
+
+@server.list_resources()
+async def handle_list_resources() -> list[types.Resource]:
+    """
+    List cached inputs, puzzle texts and submission results.
+    Only checks which cache files exist; contents are read lazily on request.
+    """
+    resources = []
+    for kind, description in RESOURCE_KINDS.items():
+        for day in client.cached_days(kind):
+            resources.append(
+                types.Resource(
+                    uri=resource_uri(day, kind),
+                    name=f"Day {day} {kind}",
+                    description=f"{description} for {client.year} day {day}",
+                    mimeType="application/json" if kind == "results" else "text/plain",
+                )
+            )
+    return resources
+
+@server.read_resource()
+async def handle_read_resource(uri: AnyUrl) -> str:
+    """
+    Read a resource of the form aoc://{year}/{day}/{input,puzzle,results}.
+    Served from the local cache, fetching inputs and puzzle text on a miss.
+    """
+    if uri.scheme != "aoc":
+        raise ValueError(f"Unsupported URI scheme: {uri.scheme}")
+
+    parts = f"{uri.host}{uri.path or ''}".strip("/").split("/")
+    if len(parts) != 3 or not parts[0].isdigit() or not parts[1].isdigit():
+        raise ValueError(f"Invalid resource URI: {uri}")
+    year, day, kind = int(parts[0]), int(parts[1]), parts[2]
+    if year != client.year:
+        raise ValueError(f"Only {client.year} resources are available")
+    if kind not in RESOURCE_KINDS:
+        raise ValueError(f"Unknown resource kind: {kind}")
+
+    if kind == "results":
+        return json.dumps(client.get_results(day), indent=2)
+    if kind == "puzzle":
+        return await get_puzzle_text(day)
+
+    cached = client.cache_file(day, kind).exists()
+    text = client.get_input(day)
+    if not cached:
+        await notify_resources_changed()
+    return text
+
+def resource_uri(day: int, kind: str) -> AnyUrl:
+    return AnyUrl(f"aoc://{client.year}/{day}/{kind}")
+
+def read_cached(day: int, kind: str) -> str | None:
+    """The cached content of a resource, or None if it isn't cached."""
+    cache_file = client.cache_file(day, kind)
+    return cache_file.read_text() if cache_file.exists() else None
+
+async def get_puzzle_text(day: int, refresh: bool = False) -> str:
+    """Get a day's puzzle text, notifying the client if the cached copy changed."""
+    previous = read_cached(day, "puzzle")
+    text = client.get_puzzle_text(day, refresh=refresh)
+    await notify_cache_changed(day, "puzzle", previous)
+    return text
+
+async def notify_cache_changed(day: int, kind: str, previous: str | None) -> None:
+    """
+    Tell the client about a change to a cached resource, given its content
+    before the change: a list change if it was newly cached, or an update if
+    its content changed.
+    """
+    current = read_cached(day, kind)
+    if previous is None and current is not None:
+        await notify_resources_changed()
+    elif current != previous:
+        await server.request_context.session.send_resource_updated(resource_uri(day, kind))
+
+async def notify_resources_changed() -> None:
+    """Tell the client that the set of cached resources has changed."""
+    await server.request_context.session.send_resource_list_changed()
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """
@@ -42,6 +133,10 @@ async def handle_list_tools() -> list[types.Tool]:
                 "type": "object",
                 "properties": {
                     "day": {"type": "integer", "minimum": 1, "maximum": 25},
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Re-fetch the text instead of using the local cache",
+                    },
                 },
                 "required": ["day"],
             },
@@ -72,7 +167,15 @@ async def handle_list_tools() -> list[types.Tool]:
                 },
                 "required": ["path"],
             },
-        )
+        ),
+        types.Tool(
+            name="server-stats",
+            description="Get per-tool call counts, latency histograms and phase timings",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+            },
+        ),
     ]
 
 @server.call_tool()
@@ -81,8 +184,24 @@ async def handle_call_tool(
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """
     Handle tool execution requests.
-    Supports getting puzzle text, submitting answers, and running Python scripts.
+    Supports getting puzzle text, submitting answers, running Python scripts,
+    and reporting server metrics.
     """
+    if name == "server-stats":
+        return [
+            types.TextContent(
+                type="text",
+                text=json.dumps(metrics.snapshot(), indent=2),
+            )
+        ]
+
+    with metrics.track(name) as stats:
+        return await call_tool(name, arguments, stats)
+
+async def call_tool(
+    name: str, arguments: dict | None, stats: ToolStats
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Run a tool, recording its phase timings into stats."""
     if not arguments:
         raise ValueError("Missing arguments")
 
@@ -91,7 +210,8 @@ async def handle_call_tool(
         if not day:
             raise ValueError("Missing day")
 
-        puzzle_text = client.get_puzzle_text(day)
+        puzzle_text = await get_puzzle_text(day, refresh=bool(arguments.get("refresh")))
+        stats.record_phases(client.last_timings)
         return [
             types.TextContent(
                 type="text",
@@ -107,7 +227,10 @@ async def handle_call_tool(
         if not all([day, part, answer]):
             raise ValueError("Missing day, part, or answer")
 
+        previous = read_cached(day, "results")
         response = client.submit_answer(day, part, answer)
+        stats.record_phases(client.last_timings)
+        await notify_cache_changed(day, "results", previous)
         return [
             types.TextContent(
                 type="text",
@@ -120,8 +243,9 @@ async def handle_call_tool(
         if not script_path:
             raise ValueError("Missing path")
 
+        timings = {}
         try:
-            stdout, stderr = run_script(script_path)
+            stdout, stderr = run_script(script_path, timings=timings)
 
             # Format output
             stdout_lines = stdout.splitlines()
@@ -147,20 +271,29 @@ async def handle_call_tool(
                 )
             ]
 
+        finally:
+            stats.record_phases(timings)
+
     raise ValueError(f"Unknown tool: {name}")
 
 async def main():
     # Run the server using stdin/stdout streams
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="aoc",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="aoc",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(resources_changed=True),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        # Optionally dump metrics on shutdown
+        metrics_file = os.getenv('AOC_METRICS_FILE')
+        if metrics_file:
+            metrics.dump(metrics_file)
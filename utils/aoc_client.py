@@ -1,9 +1,17 @@
 import os
+import json
+import time
 import requests
 from pathlib import Path
 from datetime import datetime
 from bs4 import BeautifulSoup
 
+# Heading of the second puzzle article, present once part 2 is unlocked
+PART_TWO_HEADER = "--- Part Two ---"
+
+# Start of the response message for a correct submission
+CORRECT_ANSWER = "That's the right answer"
+
 class AocClient:
     def __init__(self, session_token=None):
         self.session_token = session_token or os.getenv('AOC_SESSION')
@@ -14,48 +22,107 @@ class AocClient:
         self.year = datetime.now().year
         self.session = requests.Session()
         self.session.cookies.set('session', self.session_token)
+        # Seconds spent on network vs. parsing during the most recent call
+        self.last_timings: dict[str, float] = {}
+
+    def cache_file(self, day: int, kind: str = "input") -> Path:
+        """Return the local cache path for a day's input, puzzle text or results."""
+        suffix = {"input": ".txt", "puzzle": "_puzzle.txt", "results": "_results.json"}[kind]
+        return Path(f"inputs/{self.year}") / f"day_{day:02d}{suffix}"
+
+    def cached_days(self, kind: str = "input") -> list[int]:
+        """List the days that have cached data of the given kind, without reading it."""
+        return [day for day in range(1, 26) if self.cache_file(day, kind).exists()]
 
     def get_input(self, day: int) -> str:
         """Fetch the input for a specific day and cache it locally."""
-        cache_dir = Path(f"inputs/{self.year}")
-        cache_dir.mkdir(parents=True, exist_ok=True)
-
-        cache_file = cache_dir / f"day_{day:02d}.txt"
+        self.last_timings = {}
+        cache_file = self.cache_file(day)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
         if cache_file.exists():
             return cache_file.read_text()
 
+        start = time.perf_counter()
         response = self.session.get(f"{self.base_url}/{self.year}/day/{day}/input")
         response.raise_for_status()
+        self.last_timings['network'] = time.perf_counter() - start
 
         input_text = response.text.rstrip('\n')  # Remove trailing newlines
         cache_file.write_text(input_text)
         return input_text
 
-    def get_puzzle_text(self, day: int) -> str:
-        """Fetch the puzzle description for both parts if available."""
+    def get_puzzle_text(self, day: int, refresh: bool = False) -> str:
+        """Fetch the puzzle description for both parts if available.
+
+        The text is served from the local cache once fetched. It is only
+        fetched again with refresh=True (e.g. after part 1 was solved somewhere
+        this client can't see), or when the cached text lacks part 2 but a
+        correct part 1 answer has been recorded, so part 2 is now unlocked.
+        """
+        self.last_timings = {}
+        cache_file = self.cache_file(day, "puzzle")
+        if cache_file.exists() and not refresh:
+            cached = cache_file.read_text()
+            if PART_TWO_HEADER in cached or not self.is_solved(day, 1):
+                return cached
+
+        start = time.perf_counter()
         response = self.session.get(f"{self.base_url}/{self.year}/day/{day}")
         response.raise_for_status()
+        self.last_timings['network'] = time.perf_counter() - start
 
+        start = time.perf_counter()
         soup = BeautifulSoup(response.text, 'html.parser')
         articles = soup.find_all('article', class_='day-desc')
+        self.last_timings['parse'] = time.perf_counter() - start
 
         if not articles:
             return "Could not fetch puzzle text"
 
         # Combine all puzzle parts into one string
-        return '\n\n'.join(article.get_text() for article in articles)
+        puzzle_text = '\n\n'.join(article.get_text() for article in articles)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(puzzle_text)
+        return puzzle_text
 
     def submit_answer(self, day: int, part: int, answer: str) -> str:
         """Submit an answer and return the response message."""
         if part not in (1, 2):
             raise ValueError("Part must be 1 or 2")
 
+        self.last_timings = {}
+        start = time.perf_counter()
         response = self.session.post(
             f"{self.base_url}/{self.year}/day/{day}/answer",
             data={'level': str(part), 'answer': str(answer)}
         )
         response.raise_for_status()
+        self.last_timings['network'] = time.perf_counter() - start
 
+        start = time.perf_counter()
         soup = BeautifulSoup(response.text, 'html.parser')
-        message = soup.find('article').get_text()
-        return message.strip()
+        message = soup.find('article').get_text().strip()
+        self.last_timings['parse'] = time.perf_counter() - start
+
+        # Record the submission; a correct part 1 answer makes the next
+        # get_puzzle_text call fetch the newly unlocked part 2
+        results = self.get_results(day)
+        results.append({'part': part, 'answer': str(answer), 'response': message})
+        cache_file = self.cache_file(day, "results")
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(results, indent=2))
+        return message
+
+    def get_results(self, day: int) -> list[dict]:
+        """Return the locally recorded answer submissions for a day."""
+        cache_file = self.cache_file(day, "results")
+        if not cache_file.exists():
+            return []
+        return json.loads(cache_file.read_text())
+
+    def is_solved(self, day: int, part: int) -> bool:
+        """Whether a correct answer to this part has been recorded."""
+        return any(
+            result['part'] == part and result['response'].startswith(CORRECT_ANSWER)
+            for result in self.get_results(day)
+        )
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+
+# Byte used for the border around the grid. Newline matches the layout of an
+# input file, where the newline after each row separates it from the next.
+SENTINEL = ord('\n')
+
+class Grid:
+    """
+    A character grid stored as a flat bytearray with a sentinel border.
+
+    Each row is followed by a sentinel byte and there is a full row of
+    sentinels above and below the grid, so cell (row, col) lives at index
+    (row + 1) * stride + col with stride = width + 1. Stepping one cell off
+    the grid in any direction lands on a sentinel, so walkers can compare
+    against cell contents without bounds checks.
+    """
+
+    def __init__(self, cells: bytearray | memoryview, width: int, height: int):
+        self.cells = cells
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+
+        # Index offsets for one step in each direction, clockwise from up
+        stride = self.stride
+        self.orthogonal = (-stride, 1, stride, -1)
+        self.directions = (-stride, -stride + 1, 1, stride + 1, stride, stride - 1, -1, -stride - 1)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'Grid':
+        data = text.strip().encode('ascii')
+        width = data.find(b'\n')
+        if width == -1:
+            width = len(data)
+        border = bytes([SENTINEL]) * (width + 1)
+        cells = bytearray(border + data + b'\n' + border)
+        return cls._checked(cells, width)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> 'Grid':
+        """
+        Load a grid straight from a (cached input) file. The file already has
+        the row layout the grid uses, so it's read directly into place in the
+        buffer with no intermediate str or bytes objects.
+        """
+        path = Path(path)
+        size = path.stat().st_size
+        with open(path, 'rb') as f:
+            width = len(f.readline().rstrip(b'\n'))
+            f.seek(0)
+            stride = width + 1
+            cells = bytearray([SENTINEL]) * (stride + size + 1 + stride)
+            f.readinto(memoryview(cells)[stride:stride + size])
+        # Input files may or may not end with a newline
+        if size and cells[stride + size - 1] == SENTINEL:
+            size -= 1
+        del cells[stride + size + 1 + stride:]
+        return cls._checked(cells, width)
+
+    @classmethod
+    def _checked(cls, cells: bytearray, width: int) -> 'Grid':
+        stride = width + 1
+        height = len(cells) // stride - 2
+        if len(cells) % stride or any(cells[row * stride - 1] != SENTINEL for row in range(2, height + 2)):
+            raise ValueError("Grid rows must all be the same length")
+        return cls(cells, width, height)
+
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.stride + col
+
+    def find(self, char: str) -> int:
+        """Index of the first cell holding char, or -1."""
+        return self.cells.find(ord(char), self.stride)
+
+    def count(self, char: str) -> int:
+        return self.cells.count(ord(char))
+
+    @contextmanager
+    def overlay(self, changes: dict[int, str]):
+        """
+        Temporarily set cells (by index) for the duration of the with block,
+        restoring them afterwards. Costs O(len(changes)) rather than a copy.
+        """
+        cells = self.cells
+        saved = {index: cells[index] for index in changes}
+        try:
+            for index, char in changes.items():
+                cells[index] = ord(char)
+            yield self
+        finally:
+            for index, value in saved.items():
+                cells[index] = value
+
+    def array(self) -> np.ndarray:
+        """A (height, width) uint8 NumPy view of the cells, sharing the buffer."""
+        full = np.frombuffer(self.cells, dtype=np.uint8).reshape(-1, self.stride)
+        return full[1:self.height + 1, :self.width]
+
+    def lines(self) -> bytes:
+        """
+        Every row, column and diagonal (both families) as one newline-separated
+        bytes string. Strided slices of the buffer walk each line family, and
+        the sentinels separate the lines, so this runs at C speed.
+        """
+        cells, stride = self.cells, self.stride
+        parts = [cells]
+        parts.extend(cells[start::stride] for start in range(stride))
+        parts.extend(cells[start::stride + 1] for start in range(stride + 1))
+        parts.extend(cells[start::stride - 1] for start in range(max(stride - 1, 1)))
+        return b'\n'.join(parts)